@@ -2,25 +2,139 @@
 
 from __future__ import annotations
 import argparse
+import calendar
+import collections
+import csv
+import functools
+import json
+import re
 import sqlite3
 import sys
-from datetime import datetime
-from typing import List, Optional, Tuple
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 DB_FILE = "tasks.db"
 
 # ----- Constants / Helpers ----- #
 ALLOWED_PRIORITIES = ("low", "medium", "high")
 ALLOWED_STATUSES = ("todo", "in-progress", "done")
+# frozenset membership is a hash lookup; the tuples above keep argparse
+# choices and error messages in their documented order.
+ALLOWED_PRIORITIES_SET = frozenset(ALLOWED_PRIORITIES)
+ALLOWED_STATUSES_SET = frozenset(ALLOWED_STATUSES)
 DATE_FORMAT = "%Y-%m-%d"  # due date format
 
+# Set by init_db once the FTS5 search table is known to be usable.
+_fts_enabled = False
+
+# RETURNING lets writes skip the prior SELECT round-trip (SQLite >= 3.35).
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# One fixed UPDATE covering every column: unchanged fields are passed as
+# NULL and kept via COALESCE/CASE. A constant SQL text means every call
+# hits sqlite3's prepared-statement cache, unlike a per-field set clause.
+_UPDATE_TASK_SQL = """
+    UPDATE tasks SET
+        title = COALESCE(?, title),
+        description = COALESCE(?, description),
+        status = COALESCE(?, status),
+        priority = COALESCE(?, priority),
+        due_date = CASE WHEN ? THEN ? ELSE due_date END,
+        completed_at = CASE
+            WHEN ? IS NULL THEN completed_at
+            WHEN ? = 'done' THEN COALESCE(completed_at, ?)
+            ELSE NULL
+        END
+    WHERE id = ? RETURNING id
+"""
+
+
+# Task rows come back as a namedtuple: attribute access is a C-level index
+# lookup, several times cheaper than sqlite3.Row's case-insensitive name
+# scan, while keeping named access for callers. priority_rank is the
+# generated column (see init_db) and rides along in SELECT *.
+Task = collections.namedtuple(
+    "Task",
+    (
+        "id",
+        "title",
+        "description",
+        "status",
+        "priority",
+        "created_at",
+        "due_date",
+        "completed_at",
+        "priority_rank",
+    ),
+)
+
+
+def _task_row_factory(cur: sqlite3.Cursor, row: tuple):
+    """Map full task rows to Task; anything else stays a plain tuple."""
+    return Task._make(row) if len(row) == len(Task._fields) else row
+
 
 def get_db_connection(db_file: str = DB_FILE) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_file)
-    conn.row_factory = sqlite3.Row
+    # isolation_level=None puts sqlite3 in autocommit; writes open their own
+    # BEGIN IMMEDIATE (see _begin_write) so the writer lock is taken in one
+    # step instead of being upgraded from a read lock.
+    # cached_statements is raised so every SQL text the CLI can emit stays
+    # resident in sqlite3's per-connection prepared-statement LRU.
+    conn = sqlite3.connect(
+        db_file, isolation_level=None, cached_statements=256, factory=_Connection
+    )
+    conn.row_factory = _task_row_factory
+    # WAL + synchronous=NORMAL cuts commit cost to roughly one fdatasync per
+    # group; the rest trims read-path copies and temp spills.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB memory-mapped reads
+    conn.execute("PRAGMA foreign_keys=ON")
+    # Repeated get_task calls on the same id (scripted flows doing several
+    # ops per task) hit this dict instead of re-running the SELECT. Left off
+    # for in-memory databases, which are typically short-lived test setups.
+    if db_file != ":memory:":
+        conn._task_cache = {}
     return conn
 
 
+def _invalidate_task(conn: sqlite3.Connection, task_id: int) -> None:
+    """Drop a task from the connection's row cache after a write."""
+    cache = getattr(conn, "_task_cache", None)
+    if cache is not None:
+        cache.pop(task_id, None)
+
+
+class _Connection(sqlite3.Connection):
+    """sqlite3.Connection that can carry a reusable shared cursor and a
+    small per-connection row cache for get_task."""
+
+    _shared_cursor: Optional[sqlite3.Cursor] = None
+    _task_cache: Optional[dict] = None
+
+
+def _cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """Return the connection's shared cursor, creating it on first use.
+
+    Sharing one cursor across the CRUD helpers saves a cursor allocation per
+    call; plain sqlite3 connections just get a fresh cursor.
+    """
+    cur = getattr(conn, "_shared_cursor", None)
+    if cur is None:
+        cur = conn.cursor()
+        if isinstance(conn, _Connection):
+            conn._shared_cursor = cur
+    return cur
+
+
+def _begin_write(conn: sqlite3.Connection) -> None:
+    """Open a write transaction unless one is already in progress."""
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
 def init_db(conn: sqlite3.Connection) -> None:
     """Create table if not exists."""
     cur = conn.cursor()
@@ -34,82 +148,245 @@ def init_db(conn: sqlite3.Connection) -> None:
             priority TEXT NOT NULL,
             created_at TEXT NOT NULL,
             due_date TEXT,
-            completed_at TEXT
+            completed_at TEXT,
+            priority_rank INTEGER AS (
+                CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END
+            )
         )
         """
     )
+    # Databases created before priority_rank existed: generated columns can
+    # be added in place with ALTER TABLE.
+    try:
+        cur.execute(
+            "ALTER TABLE tasks ADD COLUMN priority_rank INTEGER AS "
+            "(CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END)"
+        )
+    except sqlite3.OperationalError:
+        pass  # column already present
+    # Composite indexes backing keyset (cursor) pagination: each page becomes
+    # an index range lookup instead of an OFFSET scan.
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created_id ON tasks(created_at, id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_due_id ON tasks(due_date, id)")
+    # Single-column and compound indexes for the filters and sorts that
+    # _build_list_query can emit, so lists are index seeks rather than full
+    # scans followed by a temp-btree sort.
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_status ON tasks(status)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_priority ON tasks(priority)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_due_date ON tasks(due_date)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON tasks(created_at DESC)")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_status_priority_due ON tasks(status, priority, due_date)"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_priority_rank ON tasks(priority_rank)")
+    _init_fts(conn)
     conn.commit()
 
 
+def _init_fts(conn: sqlite3.Connection) -> None:
+    """Set up the FTS5 search table mirroring tasks, if FTS5 is available."""
+    global _fts_enabled
+    cur = conn.cursor()
+    try:
+        existed = cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        ).fetchone()
+        cur.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                title, description,
+                content='tasks', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+            """
+        )
+        # Standard external-content sync triggers keeping tasks_fts in
+        # lockstep with tasks.
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_ai AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_ad AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_au AFTER UPDATE ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO tasks_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+            """
+        )
+        if not existed:
+            # Index rows that predate the FTS table.
+            cur.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+        _fts_enabled = True
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5 — search falls back to LIKE.
+        _fts_enabled = False
+
+
+def _fts_query(search: str) -> str:
+    """Turn raw user input into a safe FTS5 prefix query."""
+    terms = search.split()
+    return " ".join('"{}"*'.format(t.replace('"', '""')) for t in terms)
+
+
+# (second, formatted) pair so bulk inserts landing in the same second reuse
+# one formatted timestamp instead of re-rendering it per row.
+_now_cache: Tuple[int, str] = (-1, "")
+
+
 def _now_iso() -> str:
-    return datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    global _now_cache
+    t = int(time.time())
+    if t != _now_cache[0]:
+        _now_cache = (t, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t)))
+    return _now_cache[1]
 
 
 # ----- Validation ----- #
-def validate_title(title: str) -> None:
-    if not title or not title.strip():
+def canon_title(title: str) -> str:
+    """Validate and canonicalize a title in one pass.
+
+    Returns the stripped string so callers bind it directly instead of
+    stripping a second time.
+    """
+    s = title.strip() if title else ""
+    if not s:
         raise ValueError("Title must not be empty.")
+    return s
+
+
+@functools.lru_cache(maxsize=16)
+def _canon(value: str) -> str:
+    """Canonicalize a priority/status string; cached since the CLI passes
+    the same handful of literals over and over."""
+    return value.strip().lower()
 
 
 def validate_priority(priority: str) -> str:
-    p = priority.strip().lower()
-    if p not in ALLOWED_PRIORITIES:
+    # Fast path: canonical input (the common case via argparse choices)
+    # skips the strip/lower allocations entirely.
+    if priority in ALLOWED_PRIORITIES_SET:
+        return priority
+    p = _canon(priority)
+    if p not in ALLOWED_PRIORITIES_SET:
         raise ValueError(f"Priority must be one of {ALLOWED_PRIORITIES}.")
     return p
 
 
 def validate_status(status: str) -> str:
-    s = status.strip().lower()
-    if s not in ALLOWED_STATUSES:
+    if status in ALLOWED_STATUSES_SET:
+        return status
+    s = _canon(status)
+    if s not in ALLOWED_STATUSES_SET:
         raise ValueError(f"Status must be one of {ALLOWED_STATUSES}.")
     return s
 
 
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+
+
 def validate_due_date(date_str: Optional[str]) -> Optional[str]:
     if date_str is None:
         return None
     date_str = date_str.strip()
     if date_str == "":
         return None
-    try:
-        dt = datetime.strptime(date_str, DATE_FORMAT)
-        return dt.strftime(DATE_FORMAT)
-    except ValueError:
-        raise ValueError(f"Due date must be in {DATE_FORMAT} format (e.g. 2025-11-20).")
+    # A compiled regex plus an explicit range check is much cheaper than a
+    # strptime/strftime round trip, and the input is already canonical.
+    m = _DATE_RE.match(date_str)
+    if m:
+        year, month, day = int(m[1]), int(m[2]), int(m[3])
+        if 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]:
+            return date_str
+    raise ValueError(f"Due date must be in {DATE_FORMAT} format (e.g. 2025-11-20).")
 
 
 # ----- CRUD operations ----- #
+_INSERT_TASK_SQL = """
+    INSERT INTO tasks (title, description, status, priority, created_at, due_date, completed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def create_tasks_bulk(
+    conn: sqlite3.Connection, items: List[dict], autocommit: bool = False
+) -> List[int]:
+    """Insert many tasks in one transaction and return their ids.
+
+    Each item is a dict with a required 'title' and optional 'description',
+    'priority' and 'due_date' keys. All rows share one BEGIN IMMEDIATE /
+    COMMIT, so the whole batch costs a single WAL sync instead of one per
+    row. Like the other write helpers, the commit is deferred to the caller
+    unless autocommit is set.
+    """
+    if not items:
+        return []
+    created_at = _now_iso()
+    # Validate up front so a bad item aborts before the transaction opens.
+    validated = []
+    for item in items:
+        validated.append(
+            (
+                canon_title(item.get("title") or ""),
+                (item.get("description") or "").strip(),
+                validate_priority(item.get("priority") or "medium"),
+                validate_due_date(item.get("due_date")),
+            )
+        )
+    _begin_write(conn)
+    cur = _cursor(conn)
+    cur.executemany(
+        _INSERT_TASK_SQL,
+        ((t, d, "todo", p, created_at, dd, None) for t, d, p, dd in validated),
+    )
+    count = cur.rowcount
+    last = cur.execute("SELECT last_insert_rowid()").fetchone()[0]
+    if autocommit:
+        conn.commit()
+    # Rows in one transaction get consecutive ids (single writer).
+    return list(range(last - count + 1, last + 1))
+
+
 def create_task(
     conn: sqlite3.Connection,
     title: str,
     description: str = "",
     priority: str = "medium",
     due_date: Optional[str] = None,
+    autocommit: bool = False,
 ) -> int:
-    validate_title(title)
-    p = validate_priority(priority)
-    dd = validate_due_date(due_date)
-
-    created_at = _now_iso()
-    status = "todo"
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO tasks (title, description, status, priority, created_at, due_date, completed_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (title.strip(), description.strip(), status, p, created_at, dd, None),
-    )
-    conn.commit()
-    task_id = cur.lastrowid
+    task_id = create_tasks_bulk(
+        conn,
+        [{"title": title, "description": description, "priority": priority, "due_date": due_date}],
+        autocommit=autocommit,
+    )[0]
     print(f"Created task #{task_id}")
     return task_id
 
 
-def get_task(conn: sqlite3.Connection, task_id: int) -> Optional[sqlite3.Row]:
-    cur = conn.cursor()
+def get_task(conn: sqlite3.Connection, task_id: int) -> Optional[Task]:
+    cache = getattr(conn, "_task_cache", None)
+    if cache is not None and task_id in cache:
+        return cache[task_id]
+    cur = _cursor(conn)
     cur.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
     row = cur.fetchone()
+    if cache is not None and row is not None:
+        cache[task_id] = row
     return row
 
 
@@ -121,23 +398,15 @@ def update_task(
     status: Optional[str] = None,
     priority: Optional[str] = None,
     due_date: Optional[str] = None,
+    autocommit: bool = False,
 ) -> bool:
-    task = get_task(conn, task_id)
-    if not task:
-        raise LookupError(f"Task with id {task_id} not found.")
-
     updates = {}
     if title is not None:
-        validate_title(title)
-        updates["title"] = title.strip()
+        updates["title"] = canon_title(title)
     if description is not None:
         updates["description"] = description.strip()
     if status is not None:
         updates["status"] = validate_status(status)
-        if updates["status"] == "done" and not task["completed_at"]:
-            updates["completed_at"] = _now_iso()
-        elif updates["status"] != "done" and task["completed_at"]:
-            updates["completed_at"] = None
     if priority is not None:
         updates["priority"] = validate_priority(priority)
     if due_date is not None:
@@ -147,61 +416,165 @@ def update_task(
         print("No updates provided.")
         return False
 
-    set_clause = ", ".join(f"{k} = ?" for k in updates.keys())
-    params = list(updates.values()) + [task_id]
-    cur = conn.cursor()
-    cur.execute(f"UPDATE tasks SET {set_clause} WHERE id = ?", params)
-    conn.commit()
+    _begin_write(conn)
+    cur = _cursor(conn)
+    if _HAS_RETURNING:
+        new_status = updates.get("status")
+        cur.execute(
+            _UPDATE_TASK_SQL,
+            (
+                updates.get("title"),
+                updates.get("description"),
+                new_status,
+                updates.get("priority"),
+                1 if "due_date" in updates else 0,
+                updates.get("due_date"),
+                new_status,
+                new_status,
+                _now_iso(),
+                task_id,
+            ),
+        )
+        if cur.fetchone() is None:
+            raise LookupError(f"Task with id {task_id} not found.")
+    else:
+        set_parts = [f"{k} = ?" for k in updates.keys()]
+        params = list(updates.values())
+        task = get_task(conn, task_id)
+        if not task:
+            raise LookupError(f"Task with id {task_id} not found.")
+        if status is not None:
+            if updates["status"] == "done" and not task.completed_at:
+                set_parts.append("completed_at = ?")
+                params.append(_now_iso())
+            elif updates["status"] != "done" and task.completed_at:
+                set_parts.append("completed_at = ?")
+                params.append(None)
+        params.append(task_id)
+        cur.execute(f"UPDATE tasks SET {', '.join(set_parts)} WHERE id = ?", params)
+    _invalidate_task(conn, task_id)
+    if autocommit:
+        conn.commit()
     print(f"Updated task #{task_id}")
     return True
 
 
-def delete_task(conn: sqlite3.Connection, task_id: int) -> bool:
-    if not get_task(conn, task_id):
-        raise LookupError(f"Task with id {task_id} not found.")
-    cur = conn.cursor()
-    cur.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-    conn.commit()
+def delete_task(conn: sqlite3.Connection, task_id: int, autocommit: bool = False) -> bool:
+    _begin_write(conn)
+    cur = _cursor(conn)
+    if _HAS_RETURNING:
+        cur.execute("DELETE FROM tasks WHERE id = ? RETURNING id", (task_id,))
+        if cur.fetchone() is None:
+            raise LookupError(f"Task with id {task_id} not found.")
+    else:
+        if not get_task(conn, task_id):
+            raise LookupError(f"Task with id {task_id} not found.")
+        cur.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+    _invalidate_task(conn, task_id)
+    if autocommit:
+        conn.commit()
     print(f"Deleted task #{task_id}")
     return True
 
 
 # ----- Mark complete/incomplete ----- #
-def mark_complete(conn: sqlite3.Connection, task_id: int) -> bool:
-    task = get_task(conn, task_id)
-    if not task:
-        raise LookupError(f"Task {task_id} not found.")
-    if task["status"] == "done":
-        print(f"Task #{task_id} is already done.")
-        return False
-    cur = conn.cursor()
-    cur.execute(
-        "UPDATE tasks SET status = ?, completed_at = ? WHERE id = ?",
-        ("done", _now_iso(), task_id),
-    )
-    conn.commit()
+def mark_complete(conn: sqlite3.Connection, task_id: int, autocommit: bool = False) -> bool:
+    _begin_write(conn)
+    cur = _cursor(conn)
+    if _HAS_RETURNING:
+        # One conditional UPDATE; only on a miss (rare) do we probe again to
+        # tell "already done" apart from "not found".
+        cur.execute(
+            "UPDATE tasks SET status = 'done', completed_at = ? "
+            "WHERE id = ? AND status <> 'done' RETURNING id",
+            (_now_iso(), task_id),
+        )
+        if cur.fetchone() is None:
+            # The conditional UPDATE matched nothing, so there is nothing to
+            # undo; the transaction is left for the caller's group commit.
+            if autocommit:
+                conn.commit()
+            if get_task(conn, task_id) is None:
+                raise LookupError(f"Task {task_id} not found.")
+            print(f"Task #{task_id} is already done.")
+            return False
+    else:
+        task = get_task(conn, task_id)
+        if not task:
+            raise LookupError(f"Task {task_id} not found.")
+        if task.status == "done":
+            if autocommit:
+                conn.commit()
+            print(f"Task #{task_id} is already done.")
+            return False
+        cur.execute(
+            "UPDATE tasks SET status = ?, completed_at = ? WHERE id = ?",
+            ("done", _now_iso(), task_id),
+        )
+    _invalidate_task(conn, task_id)
+    if autocommit:
+        conn.commit()
     print(f"Marked task #{task_id} as complete.")
     return True
 
 
-def mark_incomplete(conn: sqlite3.Connection, task_id: int) -> bool:
-    task = get_task(conn, task_id)
-    if not task:
-        raise LookupError(f"Task {task_id} not found.")
-    if task["status"] != "done":
-        print(f"Task #{task_id} is not done.")
-        return False
-    cur = conn.cursor()
-    cur.execute(
-        "UPDATE tasks SET status = ?, completed_at = ? WHERE id = ?",
-        ("todo", None, task_id),
-    )
-    conn.commit()
+def mark_incomplete(conn: sqlite3.Connection, task_id: int, autocommit: bool = False) -> bool:
+    _begin_write(conn)
+    cur = _cursor(conn)
+    if _HAS_RETURNING:
+        cur.execute(
+            "UPDATE tasks SET status = 'todo', completed_at = NULL "
+            "WHERE id = ? AND status = 'done' RETURNING id",
+            (task_id,),
+        )
+        if cur.fetchone() is None:
+            if autocommit:
+                conn.commit()
+            if get_task(conn, task_id) is None:
+                raise LookupError(f"Task {task_id} not found.")
+            print(f"Task #{task_id} is not done.")
+            return False
+    else:
+        task = get_task(conn, task_id)
+        if not task:
+            raise LookupError(f"Task {task_id} not found.")
+        if task.status != "done":
+            if autocommit:
+                conn.commit()
+            print(f"Task #{task_id} is not done.")
+            return False
+        cur.execute(
+            "UPDATE tasks SET status = ?, completed_at = ? WHERE id = ?",
+            ("todo", None, task_id),
+        )
+    _invalidate_task(conn, task_id)
+    if autocommit:
+        conn.commit()
     print(f"Marked task #{task_id} as incomplete.")
     return True
 
 
 # ----- Listing / filtering ----- #
+# SQL fragments precomputed at import time; _build_list_query pairs them
+# positionally with its filter arguments in one tight loop instead of a
+# chain of per-filter branches.
+_FILTER_FRAGMENTS = ("status = ?", "priority = ?", "due_date <= ?", "due_date >= ?")
+
+_ORDER_SQL = {
+    # id as tiebreaker keeps page boundaries stable
+    "due": "ORDER BY due_date IS NULL, due_date, id",
+    # priority_rank (high -> medium -> low) is generated and indexed, so
+    # the planner can satisfy this ORDER BY from the index
+    "priority": "ORDER BY priority_rank",
+    None: "ORDER BY created_at DESC, id DESC",
+}
+
+_CURSOR_SQL = {
+    "due": "(due_date, id) > (?, ?)",
+    None: "(created_at, id) < (?, ?)",
+}
+
+
 def _build_list_query(
     status: Optional[str],
     priority: Optional[str],
@@ -209,37 +582,47 @@ def _build_list_query(
     due_after: Optional[str],
     search: Optional[str],
     order_by: Optional[str],
+    cursor: Optional[Tuple[str, int]] = None,
+    limit: Optional[int] = None,
 ) -> Tuple[str, List]:
     where_clauses = []
     params: List = []
-    if status:
-        where_clauses.append("status = ?")
-        params.append(status)
-    if priority:
-        where_clauses.append("priority = ?")
-        params.append(priority)
-    if due_before:
-        where_clauses.append("due_date <= ?")
-        params.append(due_before)
-    if due_after:
-        where_clauses.append("due_date >= ?")
-        params.append(due_after)
+    for frag, value in zip(_FILTER_FRAGMENTS, (status, priority, due_before, due_after)):
+        if value:
+            where_clauses.append(frag)
+            params.append(value)
     if search:
-        where_clauses.append("(title LIKE ? OR description LIKE ?)")
-        like = f"%{search}%"
-        params.extend([like, like])
+        fts = _fts_query(search) if _fts_enabled else ""
+        if fts:
+            # Tokenized inverted-index lookup instead of a full-table
+            # substring scan.
+            where_clauses.append("id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)")
+            params.append(fts)
+        else:
+            where_clauses.append("(title LIKE ? OR description LIKE ?)")
+            like = f"%{search}%"
+            params.extend([like, like])
+
+    # Keyset pagination: the cursor is the (sort key, id) pair of the last row
+    # of the previous page. Comparing against it makes every page an index
+    # range lookup, unlike OFFSET which walks and discards rows.
+    if cursor is not None:
+        if order_by == "priority":
+            raise ValueError("Cursor pagination is not supported with priority ordering.")
+        where_clauses.append(_CURSOR_SQL["due" if order_by == "due" else None])
+        params.extend(cursor)
 
     where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-    order_sql = ""
-    if order_by == "due":
-        order_sql = "ORDER BY due_date IS NULL, due_date"
-    elif order_by == "priority":
-        # custom priority order high -> medium -> low
-        order_sql = "ORDER BY CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END"
-    else:
-        order_sql = "ORDER BY created_at DESC"
+    order_sql = _ORDER_SQL.get(order_by, _ORDER_SQL[None])
+
+    # LIMIT is always present and bound as a parameter (-1 means unlimited
+    # to SQLite), so the SQL text stays identical across calls and keeps
+    # the prepared-statement cache hot.
+    if not (isinstance(limit, int) and limit > 0):
+        limit = -1
+    params.append(limit)
 
-    sql = f"SELECT * FROM tasks {where_sql} {order_sql}"
+    sql = f"SELECT * FROM tasks {where_sql} {order_sql} LIMIT ?"
     return sql, params
 
 
@@ -252,7 +635,14 @@ def list_tasks(
     search: Optional[str] = None,
     order_by: Optional[str] = None,
     limit: Optional[int] = None,
-) -> List[sqlite3.Row]:
+    cursor: Optional[Tuple[str, int]] = None,
+) -> Iterator[Task]:
+    """Yield matching tasks lazily in fetchmany-sized batches.
+
+    Streaming keeps memory at one batch regardless of result size and lets
+    row formatting overlap SQLite's stepping. Callers that need a list (and
+    the next-page cursor) should use list_tasks_materialized.
+    """
     if status:
         status = validate_status(status)
     if priority:
@@ -262,178 +652,388 @@ def list_tasks(
     if due_after:
         due_after = validate_due_date(due_after)
 
-    sql, params = _build_list_query(status, priority, due_before, due_after, search, order_by)
-    if limit and isinstance(limit, int) and limit > 0:
-        sql += f" LIMIT {limit}"
+    sql, params = _build_list_query(
+        status, priority, due_before, due_after, search, order_by, cursor, limit
+    )
+    # A dedicated cursor, not the shared one: consumption is lazy and other
+    # queries may run before this generator is exhausted.
     cur = conn.cursor()
     cur.execute(sql, params)
-    rows = cur.fetchall()
-    return rows
+    cur.arraysize = 1000
+    while batch := cur.fetchmany():
+        yield from batch
+
+
+def list_tasks_materialized(
+    conn: sqlite3.Connection,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[str] = None,
+    due_after: Optional[str] = None,
+    search: Optional[str] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[Tuple[str, int]] = None,
+) -> Tuple[List[Task], Optional[Tuple[str, int]]]:
+    """Materialize list_tasks and compute the next-page cursor."""
+    rows = list(
+        list_tasks(conn, status, priority, due_before, due_after, search, order_by, limit, cursor)
+    )
+    next_cursor = _next_cursor(rows[-1] if rows else None, len(rows), order_by, limit)
+    return rows, next_cursor
+
+
+def _next_cursor(
+    last: Optional[Task], count: int, order_by: Optional[str], limit: Optional[int]
+) -> Optional[Tuple[str, int]]:
+    """A next-page cursor only makes sense when the page came back full."""
+    if last is None or not limit or count != limit or order_by == "priority":
+        return None
+    key = last.due_date if order_by == "due" else last.created_at
+    if key is None:
+        return None
+    return (key, last.id)
+
+
+# ----- Export ----- #
+def export_tasks(
+    conn: sqlite3.Connection,
+    stream=sys.stdout,
+    fmt: str = "csv",
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[str] = None,
+    due_after: Optional[str] = None,
+    search: Optional[str] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> int:
+    """Write matching tasks to stream as CSV or JSON; returns the row count.
+
+    CSV goes through pyarrow's C++ writer when pyarrow is installed (a
+    columnar batch write instead of a per-row Python loop) and falls back
+    to the stdlib csv module otherwise. JSON always uses the stdlib since
+    pyarrow has no JSON writer. The generated priority_rank column is
+    derived data and is not exported.
+    """
+    rows = list(
+        list_tasks(conn, status, priority, due_before, due_after, search, order_by, limit)
+    )
+    fields = Task._fields[:8]
+    if fmt == "json":
+        json.dump([dict(zip(fields, r[:8])) for r in rows], stream, indent=2)
+        stream.write("\n")
+        return len(rows)
+
+    if rows:
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            pa = None
+        if pa is not None:
+            table = pa.table({f: [r[i] for r in rows] for i, f in enumerate(fields)})
+            pa_csv.write_csv(table, getattr(stream, "buffer", stream))
+            return len(rows)
+    writer = csv.writer(stream)
+    writer.writerow(fields)
+    writer.writerows(r[:8] for r in rows)
+    return len(rows)
 
 
 # ----- Presentation ----- #
-def format_task_row(row: sqlite3.Row) -> str:
+def format_task_row(row: Task) -> str:
     return (
-        f"[#{row['id']}] {row['title']} "
-        f"(status={row['status']}, priority={row['priority']}, "
-        f"due={row['due_date'] or '—'}, created={row['created_at']})"
+        f"[#{row.id}] {row.title} "
+        f"(status={row.status}, priority={row.priority}, "
+        f"due={row.due_date or '—'}, created={row.created_at})"
     )
 
 
-def print_task_detail(row: sqlite3.Row) -> None:
-    print(f"ID: {row['id']}")
-    print(f"Title: {row['title']}")
-    print(f"Description: {row['description'] or '—'}")
-    print(f"Status: {row['status']}")
-    print(f"Priority: {row['priority']}")
-    print(f"Created at: {row['created_at']}")
-    print(f"Due date: {row['due_date'] or '—'}")
-    print(f"Completed at: {row['completed_at'] or '—'}")
+def print_task_detail(row: Task) -> None:
+    print(f"ID: {row.id}")
+    print(f"Title: {row.title}")
+    print(f"Description: {row.description or '—'}")
+    print(f"Status: {row.status}")
+    print(f"Priority: {row.priority}")
+    print(f"Created at: {row.created_at}")
+    print(f"Due date: {row.due_date or '—'}")
+    print(f"Completed at: {row.completed_at or '—'}")
 
 
-def print_task_list(rows: List[sqlite3.Row]) -> None:
-    if not rows:
-        print("No tasks found.")
-        return
-    # simple table
-    print("-" * 80)
-    print(f"{'ID':<5} {'TITLE':<30} {'STATUS':<12} {'PRIORITY':<8} {'DUE':<10}")
-    print("-" * 80)
+_ROW_FMT = "{:<5} {:<30} {:<12} {:<8} {:<10}".format
+
+
+def print_task_list(rows: Iterable[Task]) -> Tuple[int, Optional[Task]]:
+    """Render rows as a table, iterating lazily.
+
+    Lines are buffered and flushed in batches, so large listings stay cheap
+    on syscalls without ever holding the whole result in memory. Returns
+    the row count and the last row seen (for cursor computation).
+    """
+    sep = "-" * 80
+    out: List[str] = []
+    append = out.append
+    write = sys.stdout.write
+    count = 0
+    last: Optional[Task] = None
     for r in rows:
-        due = r["due_date"] or "—"
-        title = r["title"]
+        if count == 0:
+            append(sep)
+            append(_ROW_FMT("ID", "TITLE", "STATUS", "PRIORITY", "DUE"))
+            append(sep)
+        count += 1
+        last = r
+        # one positional unpack instead of five attribute lookups per row
+        task_id, title, _, status, priority, _, due_date, _, _ = r
         if len(title) > 28:
             title = title[:25] + "..."
-        print(f"{r['id']:<5} {title:<30} {r['status']:<12} {r['priority']:<8} {due:<10}")
-    print("-" * 80)
-    print(f"Total: {len(rows)}")
+        append(_ROW_FMT(task_id, title, status, priority, due_date or "—"))
+        if len(out) >= 1000:
+            write("\n".join(out) + "\n")
+            out.clear()
+    if count == 0:
+        print("No tasks found.")
+        return 0, None
+    append(sep)
+    append(f"Total: {count}")
+    write("\n".join(out) + "\n")
+    return count, last
 
 
 # ----- CLI wiring (argparse) ----- #
-def build_parser() -> argparse.ArgumentParser:
+def _add_add_args(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("--title", required=True, help="Title of the task")
+    sp.add_argument("--desc", default="", help="Description")
+    sp.add_argument("--priority", default="medium", choices=ALLOWED_PRIORITIES, help="Priority")
+    sp.add_argument("--due", default=None, help=f"Due date in {DATE_FORMAT}")
+
+
+def _add_id_arg(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("id", type=int)
+
+
+def _add_list_args(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("--status", choices=ALLOWED_STATUSES)
+    sp.add_argument("--priority", choices=ALLOWED_PRIORITIES)
+    sp.add_argument("--due-before", dest="due_before", help=f"Due before {DATE_FORMAT}")
+    sp.add_argument("--due-after", dest="due_after", help=f"Due after {DATE_FORMAT}")
+    sp.add_argument("--search", help="Search in title and description")
+    sp.add_argument("--order-by", choices=("created", "due", "priority"), default="created")
+    sp.add_argument("--limit", type=int, default=None)
+    sp.add_argument("--after-created", dest="after_created", help="Cursor: created_at of the last row seen")
+    sp.add_argument("--after-due", dest="after_due", help=f"Cursor: due date of the last row seen ({DATE_FORMAT})")
+    sp.add_argument("--after-id", dest="after_id", type=int, help="Cursor: id of the last row seen")
+
+
+def _add_update_args(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("id", type=int)
+    sp.add_argument("--title", help="New title")
+    sp.add_argument("--desc", dest="description", help="New description")
+    sp.add_argument("--status", choices=ALLOWED_STATUSES, help="New status")
+    sp.add_argument("--priority", choices=ALLOWED_PRIORITIES, help="New priority")
+    sp.add_argument("--due", dest="due_date", help=f"Due date in {DATE_FORMAT}")
+
+
+def _add_import_args(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("--format", choices=("json", "csv"), default="json", help="Input format")
+
+
+def _add_export_args(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("--format", choices=("csv", "json"), default="csv", help="Output format")
+    sp.add_argument("--status", choices=ALLOWED_STATUSES)
+    sp.add_argument("--priority", choices=ALLOWED_PRIORITIES)
+    sp.add_argument("--due-before", dest="due_before", help=f"Due before {DATE_FORMAT}")
+    sp.add_argument("--due-after", dest="due_after", help=f"Due after {DATE_FORMAT}")
+    sp.add_argument("--search", help="Search in title and description")
+    sp.add_argument("--order-by", choices=("created", "due", "priority"), default="created")
+    sp.add_argument("--limit", type=int, default=None)
+
+
+# subcommand -> (help text, argument builder); subparsers are built lazily
+# from this registry so a single invocation only pays for the one it uses
+_COMMANDS = {
+    "add": ("Create a new task", _add_add_args),
+    "get": ("Get details of a task", _add_id_arg),
+    "list": ("List tasks with optional filters", _add_list_args),
+    "update": ("Update task fields", _add_update_args),
+    "complete": ("Mark task as complete", _add_id_arg),
+    "incomplete": ("Mark task as incomplete (undo complete)", _add_id_arg),
+    "delete": ("Delete a task", _add_id_arg),
+    "import": ("Bulk-import tasks from stdin", _add_import_args),
+    "export": ("Export tasks to stdout as CSV or JSON", _add_export_args),
+}
+
+
+def build_parser(only: Optional[str] = None) -> argparse.ArgumentParser:
+    """Build the CLI parser.
+
+    When `only` names a known subcommand, just that subparser is
+    constructed; -h and unknown commands fall back to the full tree.
+    """
     p = argparse.ArgumentParser(description="Task Manager CLI (single-file, SQLite)")
     sub = p.add_subparsers(dest="cmd", required=True)
+    names = (only,) if only in _COMMANDS else _COMMANDS
+    for name in names:
+        help_text, add_args = _COMMANDS[name]
+        add_args(sub.add_parser(name, help=help_text))
+    return p
 
-    # add
-    add = sub.add_parser("add", help="Create a new task")
-    add.add_argument("--title", required=True, help="Title of the task")
-    add.add_argument("--desc", default="", help="Description")
-    add.add_argument("--priority", default="medium", choices=ALLOWED_PRIORITIES, help="Priority")
-    add.add_argument("--due", default=None, help=f"Due date in {DATE_FORMAT}")
-
-    # get
-    get = sub.add_parser("get", help="Get details of a task")
-    get.add_argument("id", type=int)
-
-    # list
-    lst = sub.add_parser("list", help="List tasks with optional filters")
-    lst.add_argument("--status", choices=ALLOWED_STATUSES)
-    lst.add_argument("--priority", choices=ALLOWED_PRIORITIES)
-    lst.add_argument("--due-before", dest="due_before", help=f"Due before {DATE_FORMAT}")
-    lst.add_argument("--due-after", dest="due_after", help=f"Due after {DATE_FORMAT}")
-    lst.add_argument("--search", help="Search in title and description")
-    lst.add_argument("--order-by", choices=("created", "due", "priority"), default="created")
-    lst.add_argument("--limit", type=int, default=None)
-
-    # update
-    upd = sub.add_parser("update", help="Update task fields")
-    upd.add_argument("id", type=int)
-    upd.add_argument("--title", help="New title")
-    upd.add_argument("--desc", dest="description", help="New description")
-    upd.add_argument("--status", choices=ALLOWED_STATUSES, help="New status")
-    upd.add_argument("--priority", choices=ALLOWED_PRIORITIES, help="New priority")
-    upd.add_argument("--due", dest="due_date", help=f"Due date in {DATE_FORMAT}")
-
-    # complete
-    comp = sub.add_parser("complete", help="Mark task as complete")
-    comp.add_argument("id", type=int)
-
-    # incomplete
-    incom = sub.add_parser("incomplete", help="Mark task as incomplete (undo complete)")
-    incom.add_argument("id", type=int)
-
-    # delete
-    delete = sub.add_parser("delete", help="Delete a task")
-    delete.add_argument("id", type=int)
 
-    return p
+def _read_import_items(stream, fmt: str) -> List[dict]:
+    """Parse stdin into task dicts for create_tasks_bulk."""
+    if fmt == "csv":
+        return list(csv.DictReader(stream))
+    data = json.load(stream)
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        raise ValueError("JSON input must be an object or an array of objects.")
+    return data
+
+
+def _dispatch(conn: sqlite3.Connection, args: argparse.Namespace) -> int:
+    if args.cmd == "add":
+        create_task(conn, args.title, args.desc or "", args.priority, args.due)
+        return 0
+
+    if args.cmd == "get":
+        row = get_task(conn, args.id)
+        if not row:
+            print(f"Task {args.id} not found.")
+            return 2
+        print_task_detail(row)
+        return 0
+
+    if args.cmd == "list":
+        order_by_map = {"created": None, "due": "due", "priority": "priority"}
+        order_by = order_by_map.get(args.order_by)
+        cursor = None
+        if args.after_id is not None:
+            key = args.after_due if order_by == "due" else args.after_created
+            if key is None:
+                print("Cursor requires --after-created (or --after-due) together with --after-id.")
+                return 3
+            cursor = (key, args.after_id)
+        rows = list_tasks(
+            conn,
+            status=args.status,
+            priority=args.priority,
+            due_before=args.due_before,
+            due_after=args.due_after,
+            search=args.search,
+            order_by=order_by,
+            limit=args.limit,
+            cursor=cursor,
+        )
+        count, last = print_task_list(rows)
+        next_cursor = _next_cursor(last, count, order_by, args.limit)
+        if next_cursor:
+            flag = "--after-due" if order_by == "due" else "--after-created"
+            print(f"Next page: {flag} {next_cursor[0]} --after-id {next_cursor[1]}")
+        return 0
+
+    if args.cmd == "update":
+        updated = update_task(
+            conn,
+            args.id,
+            title=args.title,
+            description=args.description,
+            status=args.status,
+            priority=args.priority,
+            due_date=args.due_date,
+        )
+        return 0 if updated else 1
+
+    if args.cmd == "complete":
+        mark_complete(conn, args.id)
+        return 0
+
+    if args.cmd == "incomplete":
+        mark_incomplete(conn, args.id)
+        return 0
+
+    if args.cmd == "delete":
+        delete_task(conn, args.id)
+        return 0
+
+    if args.cmd == "import":
+        try:
+            items = _read_import_items(sys.stdin, args.format)
+        except json.JSONDecodeError as je:
+            print(f"Invalid JSON input: {je}")
+            return 3
+        ids = create_tasks_bulk(conn, items)
+        print(f"Imported {len(ids)} task(s).")
+        return 0
+
+    if args.cmd == "export":
+        order_by_map = {"created": None, "due": "due", "priority": "priority"}
+        export_tasks(
+            conn,
+            sys.stdout,
+            args.format,
+            status=args.status,
+            priority=args.priority,
+            due_before=args.due_before,
+            due_after=args.due_after,
+            search=args.search,
+            order_by=order_by_map.get(args.order_by),
+            limit=args.limit,
+        )
+        return 0
+
+    return 0
+
+
+# Subcommands whose whole grammar is one integer id; for these, argparse
+# (even the lazily built tree) is pure startup tax.
+_FAST_COMMANDS = frozenset(("get", "complete", "incomplete", "delete"))
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    if len(argv) == 2 and argv[0] in _FAST_COMMANDS:
+        try:
+            return argparse.Namespace(cmd=argv[0], id=int(argv[1]))
+        except ValueError:
+            pass  # not an integer; let argparse produce its usual error
+    return build_parser(argv[0] if argv else None).parse_args(argv)
 
 
 def main(argv: Optional[List[str]] = None) -> int:
     argv = argv or sys.argv[1:]
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    args = _parse_args(argv)
 
     conn = get_db_connection()
     init_db(conn)
 
     try:
-        if args.cmd == "add":
-            create_task(conn, args.title, args.desc or "", args.priority, args.due)
-            return 0
-
-        if args.cmd == "get":
-            row = get_task(conn, args.id)
-            if not row:
-                print(f"Task {args.id} not found.")
-                return 2
-            print_task_detail(row)
-            return 0
-
-        if args.cmd == "list":
-            order_by_map = {"created": None, "due": "due", "priority": "priority"}
-            order_by = order_by_map.get(args.order_by)
-            rows = list_tasks(
-                conn,
-                status=args.status,
-                priority=args.priority,
-                due_before=args.due_before,
-                due_after=args.due_after,
-                search=args.search,
-                order_by=order_by,
-                limit=args.limit,
-            )
-            print_task_list(rows)
-            return 0
-
-        if args.cmd == "update":
-            updated = update_task(
-                conn,
-                args.id,
-                title=args.title,
-                description=args.description,
-                status=args.status,
-                priority=args.priority,
-                due_date=args.due_date,
-            )
-            return 0 if updated else 1
-
-        if args.cmd == "complete":
-            mark_complete(conn, args.id)
-            return 0
-
-        if args.cmd == "incomplete":
-            mark_incomplete(conn, args.id)
-            return 0
-
-        if args.cmd == "delete":
-            delete_task(conn, args.id)
-            return 0
-
+        rc = _dispatch(conn, args)
+        # One group commit per invocation: the write helpers defer their
+        # commits (unless called with autocommit=True), so a whole command
+        # costs a single fsync.
+        if conn.in_transaction:
+            conn.commit()
+        return rc
     except ValueError as ve:
+        conn.rollback()
         print(f"Validation error: {ve}")
         return 3
     except LookupError as le:
+        conn.rollback()
         print(f"Not found error: {le}")
         return 4
     except sqlite3.Error as se:
         print(f"Database error: {se}")
         return 5
     finally:
+        # Let SQLite refresh planner statistics (sqlite_stat1) if needed.
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
         conn.close()
 
-    return 0
-
 
 if __name__ == "__main__":
     raise SystemExit(main())